@@ -0,0 +1,95 @@
+"""
+Benchmark cyc.kernels against the Python-loop baseline over sym groups.
+
+    PYTHONPATH=. python benchmarks/bench_kernels.py --syms 2000 --bars 390
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+import polars as pl
+
+from cyc import kernels
+from cyc.kernels import KERNELS
+
+
+def make_bars(n_syms: int, n_bars: int, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    ret = rng.normal(0, 1e-3, size=(n_syms, n_bars))
+    return pl.DataFrame(
+        {
+            "sym": np.repeat([f"S{i:05d}" for i in range(n_syms)], n_bars),
+            "time": np.tile(np.arange(n_bars), n_syms),
+            "price": (100 * np.cumprod(1 + ret, axis=1)).ravel(),
+            "ret": ret.ravel(),
+        }
+    ).sample(fraction=1.0, shuffle=True, seed=seed)
+
+
+def python_drawdown(df: pl.DataFrame) -> pl.DataFrame:
+    frames = []
+    for _, group in df.sort("sym", "time").group_by("sym", maintain_order=True):
+        peak, out = -np.inf, []
+        for x in group["price"].to_list():
+            peak = max(peak, x)
+            out.append(x / peak - 1)
+        frames.append(group.with_columns(pl.Series("drawdown", out)))
+    return pl.concat(frames)
+
+
+def python_reset_cumsum(df: pl.DataFrame, threshold: float) -> pl.DataFrame:
+    frames = []
+    for _, group in df.sort("sym", "time").group_by("sym", maintain_order=True):
+        total, out = 0.0, []
+        for x in group["ret"].to_list():
+            total += x
+            out.append(total)
+            if abs(total) >= threshold:
+                total = 0.0
+        frames.append(group.with_columns(pl.Series("reset_cumsum", out)))
+    return pl.concat(frames)
+
+
+def timed(label: str, func: Callable[[], object], repeat: int) -> float:
+    best = min(_once(func) for _ in range(repeat))
+    print(f"{label:<34}{best * 1000:>10.1f} ms")
+    return best
+
+
+def _once(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--syms", type=int, default=2000)
+    parser.add_argument("--bars", type=int, default=390)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_bars(args.syms, args.bars)
+    print(f"{df.height} rows, {args.syms} syms, numba={kernels.numba is not None}")
+
+    cases = [
+        ("drawdown", "price", (), lambda: python_drawdown(df)),
+        ("reset_cumsum", "ret", (0.01,), lambda: python_reset_cumsum(df, 0.01)),
+    ]
+    for name, column, params, baseline in cases:
+        kernel = KERNELS[name]
+        run = lambda: df.run_kernel(name, column, params)
+        run()  # compile outside the timing
+        base = timed(f"{name} python loop", baseline, 1)
+        fast = timed(f"{name} run_kernel", run, args.repeat)
+
+        driver, kernel.driver = kernel.driver, None
+        slow = timed(f"{name} run_kernel (no numba)", run, 1)
+        kernel.driver = driver
+        print(f"{'':<34}{base / fast:>9.0f}x vs loop, {slow / fast:.0f}x vs fallback")
+
+
+if __name__ == "__main__":
+    main()
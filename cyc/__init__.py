@@ -1,6 +1,6 @@
 """Top-level package exports for cyc."""
 
 from .df import Df
-from .data_loaders import load_data, load_data_single
+from .data_loaders import aiter_data, iter_data, load_data, load_data_single
 
-__all__ = ["Df", "load_data", "load_data_single"]
+__all__ = ["Df", "aiter_data", "iter_data", "load_data", "load_data_single"]
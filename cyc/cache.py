@@ -0,0 +1,230 @@
+"""
+Persistent on-disk memoization for study computations.
+
+    from cyc.cache import memoize
+
+    @memoize(version=1)
+    def spot_table(dates: str) -> pl.DataFrame:
+        return load_data(dates, "stock_data_day").df.get_spot(1)
+
+An entry is keyed on the function, its version and its arguments, and records
+the (path, mtime, size) fingerprint of every day file the loaders planned while
+it ran, missing and empty days included. A lookup only hits when every recorded
+file is unchanged, so rerunning over unchanged history comes back at disk speed
+while a rewritten or newly arrived day recomputes.
+Bump version whenever the function's logic changes. Arguments are hashed by
+content, so only frames, arrays, scalars, paths, dates and containers of these
+are accepted; anything else raises TypeError.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import date, time, timedelta
+from pathlib import Path, PurePath
+from typing import Any, Callable
+
+import numpy as np
+import polars as pl
+
+from .catalog import cache_dir, file_fingerprint
+from .df import Df
+
+_readers: contextvars.ContextVar[tuple[set[str], ...]] = contextvars.ContextVar(
+    "cyc_cache_readers", default=()
+)
+# loaders may record from worker threads while a memoized call snapshots its set
+_readers_lock = threading.Lock()
+
+
+def record_read(path: Path | str) -> None:
+    """
+    Called by the loaders for every file planned, whether or not it exists;
+    no-op outside a memoized call.
+    """
+    path = str(Path(path).expanduser().resolve())
+    with _readers_lock:
+        for reads in _readers.get():
+            reads.add(path)
+
+
+def memoize(
+    version: int | str = 0, max_bytes: int = 5 * 1024**3
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Cache a function returning a pl.DataFrame, pl.Series or Df under
+    $CYC_CACHE_DIR/memo (default ~/.cache/cyc/memo).
+
+    Args:
+        version: part of the key; bump it when the function's logic changes
+        max_bytes: after each write, least recently used entries are evicted
+            until the cache is at most this size
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _key(name, version, args, kwargs)
+            root = cache_dir() / "memo"
+            hit = _load(root, key)
+            if hit is not None:
+                return hit
+
+            reads: set[str] = set()
+            token = _readers.set(_readers.get() + (reads,))
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _readers.reset(token)
+            with _readers_lock:
+                sources = sorted(reads)
+            for path in sources:
+                record_read(path)
+            _store(root, key, name, result, sources)
+            _evict(root, max_bytes)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def clear() -> None:
+    """Remove every memoized entry."""
+    root = cache_dir() / "memo"
+    for path in root.glob("*"):
+        path.unlink(missing_ok=True)
+
+
+def _key(name: str, version: int | str, args: tuple, kwargs: dict) -> str:
+    digest = hashlib.sha256(f"{name}:{version}".encode())
+    for value in args:
+        _hash_value(digest, value)
+    for kw, value in sorted(kwargs.items()):
+        digest.update(f"\0{kw}=".encode())
+        _hash_value(digest, value)
+    return digest.hexdigest()
+
+
+# scalars whose repr is their full value
+_SCALARS = (type(None), bool, int, float, complex, str, bytes, date, time, timedelta)
+
+
+def _hash_value(digest: Any, value: Any) -> None:
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, Df):
+        digest.update(value.df_type.encode())
+        value = value.df
+    if isinstance(value, pl.Series):
+        value = value.to_frame()
+    if isinstance(value, pl.DataFrame):
+        buffer = io.BytesIO()
+        value.write_ipc(buffer)
+        digest.update(buffer.getvalue())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (np.generic, PurePath, *_SCALARS)):
+        digest.update(repr(value).encode())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{len(value)}".encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, (set, frozenset, dict)):
+        # unordered, so combine the sorted digests of the items
+        items = value.items() if isinstance(value, dict) else value
+        hashes = []
+        for item in items:
+            item_digest = hashlib.sha256()
+            _hash_value(item_digest, item)
+            hashes.append(item_digest.digest())
+        digest.update(b"".join(sorted(hashes)))
+    else:
+        raise TypeError(
+            f"Cannot memoize on an argument of type {type(value).__name__}: "
+            "it has no stable content hash"
+        )
+
+
+def _load(root: Path, key: str) -> Any:
+    meta_path = root / f"{key}.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+        for path, mtime, size in meta["sources"]:
+            if list(file_fingerprint(Path(path))) != [path, mtime, size]:
+                return None
+        data_path = root / f"{key}.ipc"
+        result = pl.read_ipc(data_path)
+        os.utime(meta_path)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        # also covers an entry evicted by a concurrent writer
+        return None
+
+    for path, _, _ in meta["sources"]:
+        record_read(path)
+    if meta["kind"] == "series":
+        return result.to_series()
+    if meta["kind"] == "df":
+        return Df(result, meta["df_type"])
+    return result
+
+
+def _store(root: Path, key: str, name: str, result: Any, reads: list[str]) -> None:
+    if isinstance(result, Df):
+        kind, frame = "df", result.df
+    elif isinstance(result, pl.Series):
+        kind, frame = "series", result.to_frame()
+    elif isinstance(result, pl.DataFrame):
+        kind, frame = "frame", result
+    else:
+        raise TypeError(f"{name} returned {type(result).__name__}; cannot memoize")
+
+    meta = {
+        "function": name,
+        "kind": kind,
+        "df_type": result.df_type if kind == "df" else None,
+        "sources": [list(file_fingerprint(Path(path))) for path in reads],
+    }
+    # data before meta: a reader never finds meta without its data
+    _replace(root / f"{key}.ipc", frame.write_ipc)
+    _replace(root / f"{key}.json", lambda p: Path(p).write_text(json.dumps(meta)))
+
+
+def _replace(path: Path, write: Callable[[str], Any]) -> None:
+    """Write to a temp file in the same directory, then atomically rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _evict(root: Path, max_bytes: int) -> None:
+    entries = []
+    for meta_path in root.glob("*.json"):
+        data_path = meta_path.with_suffix(".ipc")
+        try:
+            size = meta_path.stat().st_size + data_path.stat().st_size
+            entries.append((meta_path.stat().st_mtime, size, meta_path, data_path))
+        except FileNotFoundError:
+            continue  # removed by a concurrent writer
+    total = sum(size for _, size, _, _ in entries)
+    for _, size, meta_path, data_path in sorted(entries):
+        if total <= max_bytes:
+            break
+        meta_path.unlink(missing_ok=True)
+        data_path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,310 @@
+"""
+Metadata catalog of the per-day parquet files of each df_type.
+
+The catalog is built from parquet footers only (row count, schema and, with
+pyarrow installed, the time range from row-group statistics), scanned in
+parallel and cached per df_type so unchanged files are never opened again.
+Footers carry no distinct values, so the sym set is an opt-in read of the sym
+column.
+
+    python -m cyc.catalog polygon_test --dates 20241211-20241216 --drift --syms
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised without pyarrow installed
+    pq = None
+
+from .df import get_df_type_dict
+from .time_util import parse_dates
+
+CATALOG_SCHEMA = {
+    "date": pl.Date,
+    "path": pl.String,
+    "mtime": pl.Float64,
+    "size": pl.Int64,
+    "n_rows": pl.Int64,
+    "n_syms": pl.Int64,
+    "syms": pl.List(pl.String),
+    "time_min": pl.Datetime("ns"),
+    "time_max": pl.Datetime("ns"),
+    "columns": pl.List(pl.String),
+    "dtypes": pl.List(pl.String),
+}
+
+
+def cache_dir() -> Path:
+    """Root of cyc's on-disk caches: $CYC_CACHE_DIR or ~/.cache/cyc."""
+    return Path(os.environ.get("CYC_CACHE_DIR", "~/.cache/cyc")).expanduser()
+
+
+def data_root(df_type: str) -> Path:
+    return (Path(get_df_type_dict(df_type)["data"]["path"]) / df_type).expanduser()
+
+
+def file_fingerprint(path: Path) -> tuple[str, float | None, int | None]:
+    """
+    (path, mtime, size) of a file; a change in any of them invalidates caches.
+    A missing file is (path, None, None), so its later creation does too.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return str(path), None, None
+    return str(path), stat.st_mtime, stat.st_size
+
+
+def scan_catalog(
+    df_type: str,
+    dates: list[str] | None = None,
+    refresh: bool = False,
+    max_workers: int = 8,
+    syms: bool = False,
+    persist: bool = True,
+) -> pl.DataFrame:
+    """
+    Return the catalog of df_type, one row per day file.
+
+    Only files that are new or whose mtime/size changed since the cached scan
+    have their footers read.
+
+    Args:
+        dates: YYYYMMDD strings to cover; None for every file in the directory
+        refresh: ignore the cache and rescan
+        syms: also read the sym column for syms/n_syms (null otherwise)
+        persist: write the updated catalog back to the cache
+    """
+    root = data_root(df_type)
+    if not root.exists():
+        raise FileNotFoundError(f"Data path '{root}' does not exist")
+    if dates is None:
+        paths = sorted(p for p in root.glob("*.parquet") if _is_day_file(p))
+    else:
+        paths = [root / f"{date}.parquet" for date in dates]
+        paths = [p for p in paths if p.exists()]
+
+    cache_path = cache_dir() / "catalog" / f"{df_type}.parquet"
+    cached = _empty_catalog()
+    if cache_path.exists() and not refresh:
+        cached = pl.read_parquet(cache_path)
+
+    usable = cached.filter(pl.col("syms").is_not_null()) if syms else cached
+    known = {
+        (path, mtime, size)
+        for path, mtime, size in usable.select("path", "mtime", "size").iter_rows()
+    }
+    fingerprints = [file_fingerprint(p) for p in paths]
+    stale = [fp for fp in fingerprints if fp not in known]
+
+    if stale:
+        df_type_dict = get_df_type_dict(df_type)
+        sym_col, time_col = df_type_dict["sym"], df_type_dict["time"]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(
+                pool.map(lambda fp: _scan_file(fp, sym_col, time_col, syms), stale)
+            )
+        scanned = pl.DataFrame(rows, schema=CATALOG_SCHEMA, orient="row")
+        stale_paths = [path for path, _, _ in stale]
+        cached = pl.concat(
+            [cached.filter(~pl.col("path").is_in(stale_paths)), scanned]
+        ).sort("date")
+        if persist:
+            _write_atomic(cached, cache_path)
+
+    wanted = [path for path, _, _ in fingerprints]
+    return cached.filter(pl.col("path").is_in(wanted)).sort("date")
+
+
+def schema_drift(catalog: pl.DataFrame) -> pl.DataFrame:
+    """
+    Columns whose dtype changes across days or that are missing on some days.
+
+    Returns:
+        DataFrame with column, dtypes (distinct), n_days present and the first and
+        last date of each dtype
+    """
+    n_days = catalog.height
+    long = catalog.select("date", "columns", "dtypes").explode("columns", "dtypes")
+    per_dtype = long.group_by("columns", "dtypes").agg(
+        pl.len().alias("n_days"),
+        pl.col("date").min().alias("first_date"),
+        pl.col("date").max().alias("last_date"),
+    )
+    drifting = (
+        per_dtype.group_by("columns")
+        .agg(pl.len().alias("n_dtypes"), pl.col("n_days").sum().alias("total"))
+        .filter((pl.col("n_dtypes") > 1) | (pl.col("total") < n_days))
+        .select("columns")
+    )
+    return (
+        per_dtype.join(drifting, on="columns")
+        .rename({"columns": "column", "dtypes": "dtype"})
+        .sort("column", "first_date")
+    )
+
+
+def plan_reads(
+    date_list: list[str], df_type: str
+) -> tuple[list[tuple[str, Path]], list[str], pl.Schema]:
+    """
+    Plan a multi-day read from parquet footers without opening any data pages.
+
+    The cached catalog is used where it is current but never written, so a plain
+    load has no side effects under the cache directory.
+
+    Returns:
+        (date, path) of every non-empty day, the missing dates, and the schema
+        every day should be cast to before concatenation
+    """
+    catalog = scan_catalog(df_type, date_list, persist=False)
+    by_date = {
+        row["date"].strftime("%Y%m%d"): row for row in catalog.iter_rows(named=True)
+    }
+    missing = [date for date in date_list if date not in by_date]
+    files = [
+        (date, Path(by_date[date]["path"]))
+        for date in date_list
+        if date in by_date and by_date[date]["n_rows"] > 0
+    ]
+
+    # one footer read per distinct schema, then let polars find the supertypes
+    signatures: dict[tuple, Path] = {}
+    for date, path in files:
+        row = by_date[date]
+        signatures.setdefault((tuple(row["columns"]), tuple(row["dtypes"])), path)
+    schema = pl.Schema()
+    if signatures:
+        empty = [
+            pl.DataFrame(schema=pl.read_parquet_schema(p)) for p in signatures.values()
+        ]
+        schema = pl.concat(empty, how="diagonal_relaxed").schema
+    return files, missing, schema
+
+
+def _scan_file(
+    fingerprint: tuple[str, float, int], sym_col: str, time_col: str, syms: bool
+) -> dict:
+    path, mtime, size = fingerprint
+    schema = pl.read_parquet_schema(path)
+    time_min = time_max = None
+    if pq is not None:
+        meta = pq.read_metadata(path)
+        n_rows = meta.num_rows
+        if time_col in schema:
+            time_min, time_max = _footer_time_range(meta, time_col, schema[time_col])
+    else:
+        n_rows = pl.scan_parquet(path).select(pl.len()).collect().item()
+
+    sym_list = None
+    if syms:
+        sym_list = []
+        if sym_col in schema and n_rows:
+            sym_list = (
+                pl.read_parquet(path, columns=[sym_col])[sym_col]
+                .cast(pl.String)
+                .unique()
+                .sort()
+                .to_list()
+            )
+
+    return {
+        "date": datetime.strptime(Path(path).stem, "%Y%m%d").date(),
+        "path": path,
+        "mtime": mtime,
+        "size": size,
+        "n_rows": n_rows,
+        "n_syms": None if sym_list is None else len(sym_list),
+        "syms": sym_list,
+        "time_min": time_min,
+        "time_max": time_max,
+        "columns": list(schema),
+        "dtypes": [str(dtype) for dtype in schema.values()],
+    }
+
+
+def _footer_time_range(meta: Any, time_col: str, dtype: pl.DataType) -> tuple:
+    """Min and max of time_col over the row-group statistics, as naive local time."""
+    index = meta.schema.names.index(time_col)
+    values = []
+    for i in range(meta.num_row_groups):
+        stats = meta.row_group(i).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            return None, None
+        values += [stats.min, stats.max]
+    if not values:
+        return None, None
+
+    time = pl.Series(values)
+    if isinstance(dtype, pl.Datetime) and dtype.time_zone:
+        time = time.dt.convert_time_zone(dtype.time_zone).dt.replace_time_zone(None)
+    elif isinstance(time.dtype, pl.Datetime) and time.dtype.time_zone:
+        time = time.dt.replace_time_zone(None)
+    time = time.cast(pl.Datetime("ns"))
+    return time.min(), time.max()
+
+
+def _is_day_file(path: Path) -> bool:
+    try:
+        datetime.strptime(path.stem, "%Y%m%d")
+    except ValueError:
+        return False
+    return True
+
+
+def _empty_catalog() -> pl.DataFrame:
+    return pl.DataFrame(schema=CATALOG_SCHEMA)
+
+
+def _write_atomic(df: pl.DataFrame, path: Path) -> None:
+    """Write to a temp file and rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.write_parquet(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print the parquet metadata catalog of a df_type."
+    )
+    parser.add_argument("df_type", help="Entry of cyc/files/df_types.yaml")
+    parser.add_argument(
+        "--dates", default=None, help="YYYYMMDD or YYYYMMDD-YYYYMMDD (default: all)"
+    )
+    parser.add_argument(
+        "--drift", action="store_true", help="Print schema drift instead"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="Ignore the cached catalog"
+    )
+    parser.add_argument(
+        "--syms", action="store_true", help="Also read the sym column of each day"
+    )
+    args = parser.parse_args()
+
+    dates = parse_dates(args.dates) if args.dates else None
+    catalog = scan_catalog(args.df_type, dates, refresh=args.refresh, syms=args.syms)
+    result = schema_drift(catalog) if args.drift else catalog.drop("syms", "path")
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
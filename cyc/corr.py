@@ -0,0 +1,215 @@
+"""
+Pairwise correlation and lead-lag of returns across many symbols.
+
+Data is streamed one day at a time into a time x sym returns matrix, and only
+the sufficient statistics of every (sym_x, sym_y, lag) pair are kept, so memory
+depends on the number of symbols and lags, not on the number of days. Pairs are
+pairwise complete: a bar contributes to a pair only when both returns exist.
+
+For fixed memory over long ranges, pass the day iterator of the loader, which
+reads each day file once:
+
+    acc = corr_matrix(iter_data("20241201-20241231", "polygon_test", ["price"]))
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import date as _date
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import polars as pl
+
+from .df import Df
+
+_STATS = ("n", "sx", "sy", "sxx", "syy", "sxy")
+
+
+def returns_matrix(
+    df: pl.DataFrame, syms: Sequence[str], field: str = "price"
+) -> np.ndarray:
+    """
+    Build the time x sym matrix of simple returns of field, NaN where missing.
+
+    Returns are taken per (sym, day), so the first bar of each day is NaN.
+    Columns follow syms; syms absent from df are all NaN.
+    """
+    ret = (
+        df.select("sym", "time", field)
+        .filter(pl.col("sym").is_in(list(syms)))
+        .sort("sym", "time")
+        .with_columns(
+            pl.col(field)
+            .pct_change()
+            .over("sym", pl.col("time").dt.date())
+            .cast(pl.Float64)
+            .alias("_ret")
+        )
+    )
+    times = ret.select(pl.col("time").unique().sort())
+    index = pl.DataFrame({"sym": list(syms)}).with_row_index("_col")
+    cells = ret.join(index, on="sym").join(times.with_row_index("_row"), on="time")
+    out = np.full((times.height, len(syms)), np.nan)
+    values = cells["_ret"].fill_null(np.nan).to_numpy()
+    out[cells["_row"].to_numpy(), cells["_col"].to_numpy()] = values
+    return out
+
+
+class CorrAccumulator:
+    """
+    Running sufficient statistics for corr(r_x(t), r_y(t + lag)).
+
+    A positive entry at [x, y] for lag > 0 means x leads y. Statistics are
+    updated block by block so the temporaries are block_size x block_size.
+    """
+
+    def __init__(
+        self, syms: Sequence[str], lags: Sequence[int] = (0,), block_size: int = 512
+    ) -> None:
+        if any(lag < 0 for lag in lags):
+            raise ValueError("lags must be non-negative; swap x and y for leads")
+        self.syms = list(syms)
+        self.lags = list(lags)
+        self.block_size = block_size
+        n = len(self.syms)
+        self.stats = {
+            lag: {name: np.zeros((n, n)) for name in _STATS} for lag in self.lags
+        }
+
+    def add_syms(self, syms: Sequence[str]) -> "CorrAccumulator":
+        """
+        Append syms not seen yet. Their statistics start at zero, which is exact:
+        they had no observations in the days already accumulated.
+        """
+        known = set(self.syms)
+        new = [sym for sym in dict.fromkeys(syms) if sym not in known]
+        if new:
+            self.syms += new
+            pad = ((0, len(new)), (0, len(new)))
+            for stats in self.stats.values():
+                for name in _STATS:
+                    stats[name] = np.pad(stats[name], pad)
+        return self
+
+    def update(self, x: np.ndarray, sign: float = 1.0) -> "CorrAccumulator":
+        """
+        Add one day's time x sym returns matrix (sign=-1 removes it). A matrix
+        built before add_syms may have fewer columns; the rest count as missing.
+        """
+        if x.shape[1] < len(self.syms):
+            x = np.pad(
+                x, ((0, 0), (0, len(self.syms) - x.shape[1])), constant_values=np.nan
+            )
+        for lag in self.lags:
+            if x.shape[0] <= lag:
+                continue
+            a, b = x[: x.shape[0] - lag], x[lag:]
+            ma, mb = ~np.isnan(a), ~np.isnan(b)
+            a, b = np.where(ma, a, 0.0), np.where(mb, b, 0.0)
+            ma, mb = ma.astype(np.float64), mb.astype(np.float64)
+            terms = {
+                "n": (ma, mb),
+                "sx": (a, mb),
+                "sy": (ma, b),
+                "sxx": (a * a, mb),
+                "syy": (ma, b * b),
+                "sxy": (a, b),
+            }
+            stats = self.stats[lag]
+            n, step = len(self.syms), self.block_size
+            for i in range(0, n, step):
+                for j in range(0, n, step):
+                    for name, (left, right) in terms.items():
+                        block = left[:, i : i + step].T @ right[:, j : j + step]
+                        stats[name][i : i + step, j : j + step] += sign * block
+        return self
+
+    def cov(self, lag: int = 0) -> np.ndarray:
+        s = self.stats[lag]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (s["sxy"] - s["sx"] * s["sy"] / s["n"]) / (s["n"] - 1)
+
+    def corr(self, lag: int = 0) -> np.ndarray:
+        s = self.stats[lag]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            num = s["n"] * s["sxy"] - s["sx"] * s["sy"]
+            var_x = s["n"] * s["sxx"] - s["sx"] ** 2
+            var_y = s["n"] * s["syy"] - s["sy"] ** 2
+            return num / np.sqrt(var_x * var_y)
+
+    def to_frame(self, lag: int = 0, stat: str = "corr") -> pl.DataFrame:
+        """Wide frame: sym column plus one column per sym of corr or cov."""
+        matrix = self.corr(lag) if stat == "corr" else self.cov(lag)
+        return pl.DataFrame({"sym": self.syms}).hstack(
+            pl.DataFrame(matrix, schema=self.syms, orient="row")
+        )
+
+
+def corr_matrix(
+    data: pl.DataFrame | pl.LazyFrame | Df | Iterable[pl.DataFrame | Df],
+    field: str = "price",
+    lags: Sequence[int] = (0,),
+    syms: Optional[Sequence[str]] = None,
+    block_size: int = 512,
+) -> CorrAccumulator:
+    """
+    Accumulate return correlations over every day of data, one day at a time.
+
+    Args:
+        data: frame or Df with sym, time and field, or an iterable of these such
+            as iter_data(...); a LazyFrame is collected once (sym, time and field
+            only), while an iterable keeps memory at one chunk
+        lags: bar lags, e.g. [0, 1, 5]
+        syms: symbols to include (default: every sym seen, added as they appear)
+    """
+    acc = CorrAccumulator(syms or [], lags, block_size)
+    for _, day in _iter_days(data, field):
+        if syms is None:
+            acc.add_syms(day["sym"].unique().sort().to_list())
+        acc.update(returns_matrix(day, acc.syms, field))
+    return acc
+
+
+def rolling_corr(
+    data: pl.DataFrame | pl.LazyFrame | Df | Iterable[pl.DataFrame | Df],
+    window: int,
+    field: str = "price",
+    lags: Sequence[int] = (0,),
+    syms: Optional[Sequence[str]] = None,
+    block_size: int = 512,
+) -> Iterator[tuple[_date, CorrAccumulator]]:
+    """
+    Yield (date, accumulator over the last window days) for every day of data.
+
+    The accumulator is updated in place: the new day is added and the day leaving
+    the window subtracted, so copy results before advancing the iterator.
+    """
+    acc = CorrAccumulator(syms or [], lags, block_size)
+    days: deque[np.ndarray] = deque()
+    for day_value, day in _iter_days(data, field):
+        if syms is None:
+            acc.add_syms(day["sym"].unique().sort().to_list())
+        days.append(returns_matrix(day, acc.syms, field))
+        acc.update(days[-1])
+        if len(days) > window:
+            acc.update(days.popleft(), sign=-1.0)
+        yield day_value, acc
+
+
+def _iter_days(
+    data: pl.DataFrame | pl.LazyFrame | Df | Iterable[pl.DataFrame | Df], field: str
+) -> Iterator[tuple[_date, pl.DataFrame]]:
+    """Split data into days, reading each source chunk exactly once."""
+    if isinstance(data, pl.LazyFrame):
+        data = data.select("sym", "time", field).collect()
+    # a Df is not a DataFrame, and iterating it would yield single rows
+    chunks = [data] if isinstance(data, (pl.DataFrame, Df)) else data
+    for chunk in chunks:
+        frame = chunk.df if isinstance(chunk, Df) else chunk
+        frame = frame.select(
+            "sym", "time", field, pl.col("time").dt.date().alias("_day")
+        )
+        parts = frame.partition_by("_day", as_dict=True)
+        for (day_value,), part in sorted(parts.items()):
+            yield day_value, part.drop("_day")
@@ -1,17 +1,113 @@
+import asyncio
+import contextvars
 import polars as pl
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
 from tqdm import tqdm
+from .cache import record_read
+from .catalog import plan_reads
 from .df import Df, get_df_type_dict
 from .time_util import parse_dates
 
 
 def load_data_single(df_type: str) -> Df:
     data_path = get_df_type_dict(df_type)["data"]["path"]
-    return Df(pl.read_parquet(Path(data_path) / f"{df_type}.parquet"), df_type).enrich()
+    file_path = Path(data_path) / f"{df_type}.parquet"
+    record_read(file_path)
+    return Df(pl.read_parquet(file_path), df_type).enrich()
 
 
 def load_data(date_str: str | pl.Series, df_type: str) -> Df:
+    date_list = _date_list(date_str, df_type)
+    files, missing_dates, schema = plan_reads(date_list, df_type)
+    frames = [_read_day(date, path, schema) for date, path in tqdm(files)]
+
+    if missing_dates:
+        print("missing_dates:" + ", ".join(missing_dates))
+
+    combined = pl.concat(frames, how="vertical", rechunk=True)
+    return Df(combined, df_type).enrich()
+
+
+def iter_data(
+    date_str: str | pl.Series,
+    df_type: str,
+    columns: Optional[list[str]] = None,
+    prefetch: int = 2,
+    chunk_days: int = 1,
+) -> Iterator[Df]:
+    """
+    Yield enriched Df chunks of chunk_days days in date order while a background
+    thread pool reads the next prefetch chunks, so at most prefetch + 2 chunks
+    are in memory however long the range is: the one the consumer holds and
+    prefetch + 1 read ahead.
+
+    Args:
+        columns: columns to read (sym and time source columns are always read)
+        prefetch: number of chunks read ahead
+        chunk_days: number of days per yielded Df
+    """
+    date_list = _date_list(date_str, df_type)
+    files, missing_dates, schema = plan_reads(date_list, df_type)
+    if missing_dates:
+        print("missing_dates:" + ", ".join(missing_dates))
+
+    if columns is not None:
+        df_type_dict = get_df_type_dict(df_type)
+        keep = {df_type_dict["sym"], df_type_dict["time"], *columns}
+        schema = pl.Schema({k: v for k, v in schema.items() if k in keep})
+    chunks = [files[i : i + chunk_days] for i in range(0, len(files), chunk_days)]
+
+    def read_chunk(chunk: list[tuple[str, Path]]) -> Df:
+        frames = [_read_day(date, path, schema) for date, path in chunk]
+        return Df(pl.concat(frames, how="vertical", rechunk=True), df_type).enrich()
+
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as pool:
+        try:
+            for chunk in chunks:
+                # run in a copy of this context so memoized callers see the reads
+                context = contextvars.copy_context()
+                pending.append(pool.submit(context.run, read_chunk, chunk))
+                if len(pending) > prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_data(
+    date_str: str | pl.Series,
+    df_type: str,
+    columns: Optional[list[str]] = None,
+    prefetch: int = 2,
+    chunk_days: int = 1,
+) -> AsyncIterator[Df]:
+    """Async version of iter_data; waiting for a chunk does not block the loop."""
+    it = iter_data(date_str, df_type, columns, prefetch, chunk_days)
+    done = object()
+    step = None
+    try:
+        while True:
+            # shielded so a cancelled consumer leaves the worker's next running
+            step = asyncio.ensure_future(asyncio.to_thread(next, it, done))
+            if (item := await asyncio.shield(step)) is done:
+                break
+            yield item
+    finally:
+        # closing a generator that is still executing raises, so wait it out;
+        # close joins the prefetch pool, so it runs off the loop too
+        if step is not None and not step.done():
+            await asyncio.wait([step])
+        await asyncio.to_thread(it.close)
+
+
+def _date_list(date_str: str | pl.Series, df_type: str) -> list[str]:
     data_path = get_df_type_dict(df_type)["data"]["path"]
     if isinstance(date_str, pl.Series):
         date_list = [d.strftime("%Y%m%d") for d in date_str.to_list()]
@@ -23,22 +119,26 @@ def load_data(date_str: str | pl.Series, df_type: str) -> Df:
 
     if not date_list:
         raise ValueError(f"No dates provided or found in range")
+    # missing and empty days too, so a memoized result sees them arrive
+    for date in date_list:
+        record_read(data_root / f"{date}.parquet")
+    return date_list
 
-    frames: list[pl.DataFrame] = []
-    missing_dates: list[str] = []
-
-    for date in tqdm(date_list):
-        file_path = data_root / f"{date}.parquet"
-        if not file_path.exists():
-            missing_dates.append(date)
-            continue
-        date_value = datetime.strptime(date, "%Y%m%d").date()
-        frames.append(
-            pl.read_parquet(file_path).with_columns(pl.lit(date_value).alias("date"))
-        )
 
-    if missing_dates:
-        print("missing_dates:" + ", ".join(missing_dates))
+def _read_day(date: str, file_path: Path, schema: pl.Schema) -> pl.DataFrame:
+    date_value = datetime.strptime(date, "%Y%m%d").date()
+    available = pl.read_parquet_schema(file_path)
+    df = pl.read_parquet(file_path, columns=[c for c in schema if c in available])
+    return _conform(df, schema).with_columns(pl.lit(date_value).alias("date"))
 
-    combined = pl.concat(frames, how="vertical_relaxed", rechunk=True)
-    return Df(combined, df_type).enrich()
+
+def _conform(df: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    """Cast df to the planned schema, adding columns this day lacks as nulls."""
+    return df.select(
+        (
+            pl.col(name).cast(dtype)
+            if name in df.columns
+            else pl.lit(None, dtype).alias(name)
+        )
+        for name, dtype in schema.items()
+    )
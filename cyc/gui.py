@@ -1,6 +1,7 @@
 import polars as pl
 import altair as alt
 import numpy as np
+from typing import Optional
 
 
 def gs(x: pl.Series, y: pl.Series, k: int = 20, filter=None) -> alt.LayerChart:
@@ -69,3 +70,138 @@ def gs(x: pl.Series, y: pl.Series, k: int = 20, filter=None) -> alt.LayerChart:
 
     title = f"y = {coef:.4g}x + {intercept:.4g}, R² = {r2:.4f}"
     return (points + line).properties(width=600, height=400, title=title).interactive()
+
+
+def screen(
+    df: pl.DataFrame | pl.LazyFrame,
+    features: list[str],
+    targets: str | list[str],
+    by: Optional[str | list[str]] = None,
+) -> pl.DataFrame:
+    """
+    The regression statistics of gs for every (feature, target) pair in one pass
+
+    For each pair, rows where either side is null are dropped, then
+    n, slope, intercept, r2, t_stat (of the slope) and corr are computed from
+    means, variances and covariance aggregated in a single select/group_by.
+
+    Args:
+        by: optional breakdown columns, e.g. "date" or "sym"
+
+    Returns:
+        Tidy frame with by columns, feature, target and the statistics
+    """
+    targets = [targets] if isinstance(targets, str) else targets
+    by = [by] if isinstance(by, str) else by or []
+
+    aggs = []
+    for i, f in enumerate(features):
+        for j, t in enumerate(targets):
+            valid = pl.col(f).is_not_null() & pl.col(t).is_not_null()
+            x = pl.col(f).filter(valid).cast(pl.Float64)
+            y = pl.col(t).filter(valid).cast(pl.Float64)
+            aggs.append(
+                pl.struct(
+                    pl.lit(f).alias("feature"),
+                    pl.lit(t).alias("target"),
+                    x.len().alias("n"),
+                    x.mean().alias("x_mean"),
+                    y.mean().alias("y_mean"),
+                    x.var().alias("var_x"),
+                    y.var().alias("var_y"),
+                    pl.cov(x, y).alias("cov"),
+                ).alias(f"_{i}_{j}")
+            )
+
+    lf = df.lazy()
+    stats = lf.group_by(by).agg(aggs) if by else lf.select(aggs)
+    pairs = [f"_{i}_{j}" for i in range(len(features)) for j in range(len(targets))]
+    slope = pl.col("cov") / pl.col("var_x")
+    corr = pl.col("cov") / (pl.col("var_x") * pl.col("var_y")).sqrt()
+    return (
+        stats.unpivot(pairs, index=by)
+        .unnest("value")
+        .select(
+            *by,
+            "feature",
+            "target",
+            "n",
+            slope.alias("slope"),
+            (pl.col("y_mean") - slope * pl.col("x_mean")).alias("intercept"),
+            (corr**2).alias("r2"),
+            (corr * ((pl.col("n") - 2) / (1 - corr**2)).sqrt()).alias("t_stat"),
+            corr.alias("corr"),
+        )
+        .sort(*by, "feature", "target")
+        .collect()
+    )
+
+
+def screen_buckets(
+    df: pl.DataFrame | pl.LazyFrame,
+    features: list[str],
+    targets: str | list[str],
+    k: int = 20,
+    by: Optional[str | list[str]] = None,
+) -> pl.DataFrame:
+    """
+    The bucketed means of gs for every (feature, target) pair: rows where either
+    side is null are dropped, x is cut into k equal-width buckets between its
+    min and max (per by group), then n and the means of x and y are taken per
+    bucket. Features and targets are unpivoted to long form once and aggregated
+    in a single group_by.
+
+    Returns:
+        Tidy frame with by columns, feature, target, bucket, n, x and y
+    """
+    targets = [targets] if isinstance(targets, str) else targets
+    by = [by] if isinstance(by, str) else by or []
+
+    # one struct of x, y and an integer (pair, bucket) key per pair, unpivoted to
+    # long form once so a single group_by covers every feature and target
+    pairs = pl.DataFrame(
+        [(f, t) for f in features for t in targets],
+        schema=["feature", "target"],
+        orient="row",
+    ).with_row_index("_pair")
+    structs = []
+    for i, (f, t) in enumerate(pairs.select("feature", "target").iter_rows()):
+        valid = pl.col(f).is_not_null() & pl.col(t).is_not_null()
+        x = pl.when(valid).then(pl.col(f).cast(pl.Float64))
+        x_min, x_max = x.min(), x.max()
+        if by:
+            x_min, x_max = x_min.over(by), x_max.over(by)
+        width = pl.when(x_max > x_min).then((x_max - x_min) / k).otherwise(1.0)
+        bucket = ((x - x_min) / width).floor().cast(pl.Int64).clip(0, k - 1)
+        structs.append(
+            pl.struct(
+                x.alias("x"),
+                pl.col(t).cast(pl.Float64).alias("y"),
+                (bucket + i * k).alias("_key"),
+            ).alias(f"_{i}")
+        )
+
+    key = pl.col("_key")
+    return (
+        df.lazy()
+        .select(*by, *structs)
+        .unpivot(index=by)
+        .select(*by, pl.col("value").struct.unnest())
+        .drop_nulls("x")
+        .group_by(*by, "_key")
+        .agg(pl.len().alias("n"), pl.col("x").mean(), pl.col("y").mean())
+        .collect()
+        .with_columns((key // k).cast(pairs["_pair"].dtype).alias("_pair"))
+        .join(pairs, on="_pair")
+        .select(*by, "feature", "target", (key % k).alias("bucket"), "n", "x", "y")
+        .sort(*by, "feature", "target", "bucket")
+    )
+
+
+def gs_row(df: pl.DataFrame, row: dict, k: int = 20) -> alt.LayerChart:
+    """Plot gs for one row of screen, restricted to the row's by group if any."""
+    stat_cols = {"feature", "target", "n", "slope", "intercept", "r2", "t_stat", "corr"}
+    keys = [c for c in row if c not in stat_cols and c in df.columns]
+    if keys:
+        df = df.filter(*[pl.col(c) == row[c] for c in keys])
+    return gs(df[row["feature"]], df[row["target"]], k=k)
@@ -0,0 +1,177 @@
+"""
+Path-dependent per-sym kernels over contiguous NumPy buffers.
+
+A kernel is a plain loop over one group, written so Numba can compile it:
+
+    @register_kernel("drawdown")
+    def drawdown(start, end, cols, params, out):
+        peak = -np.inf
+        for i in range(start, end):
+            ...
+
+cols is a tuple of 1D arrays (the requested columns of the whole frame, each
+sym contiguous and sorted by time), params a tuple of floats and out the float64
+result buffer; the kernel fills out[start:end] for the group spanning rows
+start..end. With Numba installed every kernel is compiled and groups run in
+parallel; otherwise each group runs the optional NumPy fallback, or the kernel
+itself in Python.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import polars as pl
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - exercised without numba installed
+    numba = None
+
+
+@dataclass
+class Kernel:
+    name: str
+    func: Callable
+    fallback: Optional[Callable] = None
+    driver: Optional[Callable] = None
+
+
+KERNELS: dict[str, Kernel] = {}
+
+
+def register_kernel(
+    name: str, fallback: Optional[Callable] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Register a kernel under name.
+
+    Args:
+        fallback: fallback(cols, params) -> np.ndarray computing one group with
+            NumPy, used instead of the Python loop when Numba is missing
+    """
+
+    def decorator(func: Callable) -> Callable:
+        driver = _compile(func) if numba is not None else None
+        KERNELS[name] = Kernel(name, func, fallback, driver)
+        return func
+
+    return decorator
+
+
+def run_kernel(
+    self: pl.DataFrame,
+    name: str,
+    columns: str | Sequence[str],
+    params: Sequence[float] = (),
+    by: str = "sym",
+    order: str = "time",
+    alias: Optional[str] = None,
+) -> pl.DataFrame:
+    """
+    Run a registered kernel per by group in order and add its result as a column.
+
+    Args:
+        columns: input column(s), passed to the kernel as cols in this order
+        params: scalar parameters, passed as a tuple of floats
+        alias: output column name (default: name)
+
+    Returns:
+        self with the float64 result column, rows in their original order
+    """
+    kernel = KERNELS[name]
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    # hash grouping then a per-group sort is cheaper than a global sort on sym;
+    # inputs may be by or order themselves, so each column is projected once
+    # and by is only carried through when it is an input
+    values = pl.all() if by in columns else pl.exclude(by)
+    grouped = (
+        self.select(*dict.fromkeys([by, order, *columns]))
+        .with_row_index("_row")
+        .group_by(pl.col(by).alias("_by"))
+        .agg(values.sort_by(order), pl.len().alias("_len"))
+    )
+    ordered = grouped.select(pl.exclude("_by", "_len")).explode(pl.all())
+    offsets = np.zeros(grouped.height + 1, dtype=np.int64)
+    np.cumsum(grouped["_len"].to_numpy(), out=offsets[1:])
+    # zero-copy for numeric columns without nulls
+    cols = tuple(ordered[c].to_numpy() for c in columns)
+    params = tuple(float(p) for p in params)
+    out = np.empty(ordered.height, dtype=np.float64)
+
+    if kernel.driver is not None:
+        kernel.driver(offsets, cols, params, out)
+    else:
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            if kernel.fallback is not None:
+                group = tuple(c[start:end] for c in cols)
+                out[start:end] = kernel.fallback(group, params)
+            else:
+                kernel.func(start, end, cols, params, out)
+
+    result = np.empty_like(out)
+    result[ordered["_row"].to_numpy()] = out
+    return self.with_columns(pl.Series(alias or name, result))
+
+
+def _compile(func: Callable) -> Callable:
+    kernel = numba.njit(cache=False)(func)
+
+    @numba.njit(parallel=True)
+    def driver(offsets, cols, params, out):
+        for g in numba.prange(len(offsets) - 1):
+            kernel(offsets[g], offsets[g + 1], cols, params, out)
+
+    return driver
+
+
+def _drawdown_numpy(cols: tuple, params: tuple) -> np.ndarray:
+    x = cols[0].astype(np.float64)
+    return x / np.fmax.accumulate(x) - 1
+
+
+@register_kernel("drawdown", fallback=_drawdown_numpy)
+def drawdown(start, end, cols, params, out):
+    """x / running max of x - 1, i.e. 0 at a new high and negative below it."""
+    x = cols[0]
+    peak = -np.inf
+    for i in range(start, end):
+        if x[i] > peak:
+            peak = x[i]
+        out[i] = x[i] / peak - 1
+
+
+@register_kernel("reset_cumsum")
+def reset_cumsum(start, end, cols, params, out):
+    """
+    Cumulative sum of x that resets to 0 after |sum| reaches params[0]; the row
+    that triggers the reset still reports the sum it reached.
+    """
+    x, threshold = cols[0], params[0]
+    total = 0.0
+    for i in range(start, end):
+        if not np.isnan(x[i]):
+            total += x[i]
+        out[i] = total
+        if abs(total) >= threshold:
+            total = 0.0
+
+
+@register_kernel("sign_run")
+def sign_run(start, end, cols, params, out):
+    """Signed length of the current run of same-sign x; 0 resets the run."""
+    x = cols[0]
+    run = 0.0
+    for i in range(start, end):
+        if x[i] > 0:
+            run = run + 1 if run > 0 else 1.0
+        elif x[i] < 0:
+            run = run - 1 if run < 0 else -1.0
+        else:
+            run = 0.0
+        out[i] = run
+
+
+pl.DataFrame.run_kernel = run_kernel  # type: ignore[attr-defined]
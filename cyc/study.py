@@ -3,7 +3,12 @@ from __future__ import annotations
 import polars as pl
 
 from cyc.data_loaders import load_data
-from cyc.time_util import next_trading_day, previous_trading_day
+from cyc.time_util import (
+    next_trading_day,
+    parse_duration_to_ns,
+    previous_trading_day,
+    session_closes,
+)
 
 
 def get_stock(self: pl.DataFrame, fields: str | list[str]) -> pl.DataFrame:
@@ -66,5 +71,186 @@ def _get_spot(
     return (spot - dividend) / split
 
 
+def get_fwd_returns(
+    self: pl.DataFrame | pl.LazyFrame,
+    horizons: list[str],
+    field: str = "price",
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Add forward returns of field for every row, per (sym, trading day).
+
+    Each horizon is priced as of the last row of the same sym and day at or
+    before time + horizon, so gaps are forward filled and nothing leaks across
+    days. Targets past the session close (early closes included) are null, as
+    are all returns of rows after the close.
+
+    Args:
+        horizons: durations such as "1m", "5m", "30m", or "close" for to-close
+        field: price field (default: price)
+
+    Returns:
+        self with one column per horizon, e.g. ret_5m, ret_close. A LazyFrame
+        input stays lazy.
+    """
+    time_dtype = self.collect_schema()["time"]
+    closes = session_closes(getattr(time_dtype, "time_zone", None)).with_columns(
+        pl.col("close").cast(time_dtype).alias("_close")
+    )
+    lf = (
+        self.lazy()
+        .with_row_index("_row")
+        .with_columns(pl.col("time").dt.date().alias("_day"))
+        .join(
+            closes.lazy().select("date", "_close"),
+            left_on="_day",
+            right_on="date",
+            how="left",
+        )
+        .sort("sym", "_day", "time")
+    )
+
+    # one sort, then every horizon is a binary search within its (sym, day)
+    group = ["sym", "_day"]
+    labels = []
+    for horizon in horizons:
+        if horizon == "close":
+            target = pl.col("_close")
+        else:
+            offset = parse_duration_to_ns(horizon)
+            shifted = pl.col("time") + pl.duration(nanoseconds=offset)
+            target = shifted.cast(time_dtype)
+        found = pl.col("time").search_sorted(target, side="right").cast(pl.Int64)
+        # rows whose target precedes the day's first row are masked below
+        pos = (found - 1).clip(0)
+        price = pl.col(field).gather(pos).over(group)
+        in_session = (target <= pl.col("_close")) & (
+            pl.col("time") <= pl.col("_close")
+        )
+        ret = pl.when(in_session).then(price / pl.col(field) - 1)
+        labels.append(ret.alias(f"ret_{horizon}"))
+    lf = lf.with_columns(labels)
+
+    result = lf.sort("_row").drop("_row", "_day", "_close")
+    return result if isinstance(self, pl.LazyFrame) else result.collect()
+
+
+def event_paths(
+    data: pl.DataFrame | pl.LazyFrame,
+    events: pl.DataFrame,
+    window: tuple[int, int],
+    field: str = "price",
+    unit: str = "d",
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Gather field around every event in one join, aligned on relative time.
+
+    Args:
+        data: frame with sym, time and field
+        events: sym plus date (unit "d") or time (unit "m"); other columns are kept
+        window: inclusive (start, end) offsets, e.g. (-5, 20)
+        unit: "d" steps through the sym's trading days in data, using each day's
+            last row; "m" steps through minutes of the event's day, priced as of
+            the last row at or before
+
+    Returns:
+        Long frame with event_id, the event columns, rel, field and ret, where
+        ret is field relative to rel 0. Offsets outside the data are null. A
+        LazyFrame input stays lazy.
+    """
+    if unit not in ("d", "m"):
+        raise ValueError(f"Invalid unit '{unit}'")
+    start, end = window
+    offsets = pl.LazyFrame({"rel": pl.int_range(start, end + 1, eager=True)})
+    ev = events.lazy().with_row_index("event_id")
+    lf = data.lazy().select(
+        "sym", "time", pl.col("time").dt.date().alias("_day"), field
+    )
+
+    if unit == "d":
+        # one row per trading day, so intraday bars step by days, not bars
+        lf = (
+            lf.group_by("sym", "_day")
+            .agg(pl.col(field).sort_by("time").last())
+            .sort("sym", "_day")
+            .with_columns(pl.int_range(pl.len()).over("sym").alias("_idx"))
+        )
+        anchor = (
+            ev.select("event_id", "sym", pl.col("date").cast(pl.Date).alias("_day"))
+            .sort("_day")
+            .join_asof(
+                lf.select("sym", "_day", "_idx").sort("_day"),
+                on="_day",
+                by="sym",
+                strategy="forward",
+                check_sortedness=False,
+            )
+        )
+        paths = (
+            anchor.join(offsets, how="cross")
+            .with_columns((pl.col("_idx") + pl.col("rel")).alias("_idx"))
+            .join(lf.select("sym", "_idx", field), on=["sym", "_idx"], how="left")
+        )
+    else:
+        day_end = lf.group_by("sym", "_day").agg(pl.col("time").max().alias("_end"))
+        time_dtype = lf.collect_schema()["time"]
+        target = (pl.col("time") + pl.duration(minutes=pl.col("rel"))).cast(time_dtype)
+        paths = (
+            ev.select(
+                "event_id", "sym", "time", pl.col("time").dt.date().alias("_day")
+            )
+            .join(offsets, how="cross")
+            .with_columns(target.alias("time"))
+            .sort("time")
+            .join_asof(
+                lf.select("sym", "_day", "time", field).sort("time"),
+                on="time",
+                by=["sym", "_day"],
+                strategy="backward",
+                check_sortedness=False,
+            )
+            .join(day_end, on=["sym", "_day"], how="left")
+            .with_columns(
+                pl.when(pl.col("time") <= pl.col("_end"))
+                .then(pl.col(field))
+                .alias(field)
+            )
+        )
+
+    anchor_value = pl.col(field).filter(pl.col("rel") == 0).first().over("event_id")
+    result = (
+        paths.select("event_id", "rel", field)
+        .with_columns((pl.col(field) / anchor_value - 1).alias("ret"))
+        .join(ev, on="event_id", how="left")
+        .select("event_id", *events.columns, "rel", field, "ret")
+        .sort("event_id", "rel")
+    )
+    return result if isinstance(data, pl.LazyFrame) else result.collect()
+
+
+def event_summary(
+    paths: pl.DataFrame | pl.LazyFrame, col: str = "ret", z: float = 1.96
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Aggregate event_paths output per rel: count, mean, median, std and a normal
+    confidence interval of the mean at z standard errors.
+    """
+    value = pl.col(col)
+    half_width = z * value.std() / value.count().sqrt()
+    return (
+        paths.group_by("rel")
+        .agg(
+            value.count().alias("n"),
+            value.mean().alias("mean"),
+            value.median().alias("median"),
+            value.std().alias("std"),
+            (value.mean() - half_width).alias("ci_low"),
+            (value.mean() + half_width).alias("ci_high"),
+        )
+        .sort("rel")
+    )
+
+
 pl.DataFrame.get_stock = get_stock  # type: ignore[attr-defined]
 pl.DataFrame.get_spot = get_spot  # type: ignore[attr-defined]
+pl.DataFrame.get_fwd_returns = get_fwd_returns  # type: ignore[attr-defined]
+pl.LazyFrame.get_fwd_returns = get_fwd_returns  # type: ignore[attr-defined]
@@ -45,6 +45,23 @@ def parse_time_to_ns(raw: str) -> int:
     return total_seconds * 1_000_000_000 + nanosecond
 
 
+def parse_duration_to_ns(raw: str) -> int:
+    """
+    raw: 30s, 5m, 1h or 1.5m
+    """
+    raw = raw.strip()
+    units = {"s": 1_000_000_000, "m": 60_000_000_000, "h": 3_600_000_000_000}
+    if len(raw) < 2 or raw[-1] not in units:
+        raise ValueError(f"Invalid duration string '{raw}'")
+    try:
+        value = float(raw[:-1])
+    except ValueError as exc:
+        raise ValueError(f"Invalid duration string '{raw}'") from exc
+    if value <= 0:
+        raise ValueError(f"Invalid duration string '{raw}'")
+    return int(round(value * units[raw[-1]]))
+
+
 def parse_dates(date: str) -> list[str]:
     """
     Given a date in the format of YYYYMMDD-YYYYMMDD. For example '20240101-20240110',
@@ -103,6 +120,33 @@ def next_trading_day(date: pl.Series) -> pl.Series:
     return date.map_elements(_next, return_dtype=pl.Date)
 
 
+def session_closes(time_zone: str | None = "America/New_York") -> pl.DataFrame:
+    """
+    Return a DataFrame of (date, close) for every NYSE session, early closes included.
+
+    close is converted to time_zone. With time_zone=None it is the naive New York
+    wall-clock time, matching data whose time column carries no time zone.
+    """
+    close = _session_closes_utc().with_columns(
+        pl.col("close").dt.convert_time_zone(time_zone or "America/New_York")
+    )
+    if time_zone is None:
+        close = close.with_columns(pl.col("close").dt.replace_time_zone(None))
+    return close
+
+
+@lru_cache(maxsize=1)
+def _session_closes_utc() -> pl.DataFrame:
+    schedule = _NYSE.schedule
+    close_utc = schedule["close"].dt.tz_localize(None).to_numpy()
+    return pl.DataFrame(
+        {
+            "date": pl.Series(schedule.index.date.tolist(), dtype=pl.Date),
+            "close": pl.Series(close_utc.astype("datetime64[ns]")),
+        }
+    ).with_columns(pl.col("close").dt.replace_time_zone("UTC"))
+
+
 @lru_cache(maxsize=1024)
 def _is_trading_day(day: _date) -> bool:
     return _NYSE.is_session(day)
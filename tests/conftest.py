@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+import cyc.catalog
+import cyc.data_loaders
+import cyc.df
+
+
+@pytest.fixture
+def day_files(tmp_path, monkeypatch):
+    root = tmp_path / "data" / "drift_test"
+    root.mkdir(parents=True)
+    pl.DataFrame(
+        {
+            "sym": ["A", "B"],
+            "time": [datetime(2024, 12, 11, 9, 30), datetime(2024, 12, 11, 9, 31)],
+            "price": pl.Series([1.0, 2.0], dtype=pl.Float32),
+        }
+    ).write_parquet(root / "20241211.parquet")
+    pl.DataFrame(
+        {
+            "sym": ["A"],
+            "time": [datetime(2024, 12, 12, 9, 30)],
+            "price": [3.0],
+            "size": [10],
+        }
+    ).write_parquet(root / "20241212.parquet")
+    pl.DataFrame(
+        schema={"sym": pl.String, "time": pl.Datetime("us"), "price": pl.Float64}
+    ).write_parquet(root / "20241213.parquet")
+
+    df_type_dict = {
+        "cols": {},
+        "sym": "sym",
+        "time": "time",
+        "data": {"path": str(tmp_path / "data")},
+    }
+    for module in (cyc.catalog, cyc.data_loaders, cyc.df):
+        monkeypatch.setattr(module, "get_df_type_dict", lambda _: df_type_dict)
+    monkeypatch.setenv("CYC_CACHE_DIR", str(tmp_path / "cache"))
+    return root
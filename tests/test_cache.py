@@ -0,0 +1,113 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import polars as pl
+import pytest
+
+from cyc.cache import clear, memoize
+from cyc.data_loaders import iter_data, load_data
+from cyc.df import Df
+
+
+def test_memoize_hits_until_source_changes(day_files):
+    calls = []
+
+    @memoize(version=1)
+    def prices(dates: str, scale: float = 1.0) -> pl.DataFrame:
+        calls.append(dates)
+        return load_data(dates, "drift_test").df.select(pl.col("price") * scale)
+
+    first = prices("20241211-20241212")
+    assert prices("20241211-20241212").equals(first)
+    assert len(calls) == 1
+
+    prices("20241211-20241212", scale=2.0)
+    assert len(calls) == 2
+
+    path = day_files / "20241212.parquet"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    prices("20241211-20241212")
+    assert len(calls) == 3
+
+
+def test_memoize_tracks_prefetch_threads_and_nesting(day_files):
+    calls = []
+
+    @memoize()
+    def first_day(dates: str) -> Df:
+        calls.append(dates)
+        return next(iter_data(dates, "drift_test", prefetch=2))
+
+    @memoize()
+    def outer(dates: str) -> pl.Series:
+        return first_day(dates)["price"]
+
+    assert isinstance(first_day("20241211-20241213"), Df)
+    outer("20241211-20241213")
+    assert len(calls) == 1
+
+    # outer inherits the files read by the cached inner call
+    path = day_files / "20241211.parquet"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert isinstance(outer("20241211-20241213"), pl.Series)
+    assert len(calls) == 2
+
+
+def test_memoize_tracks_missing_and_empty_days(day_files):
+    calls = []
+
+    @memoize()
+    def syms(dates: str) -> pl.Series:
+        calls.append(dates)
+        return load_data(dates, "drift_test").df["sym"]
+
+    syms("20241211-20241216")
+    syms("20241211-20241216")
+    assert len(calls) == 1
+
+    # a missing day arriving invalidates the entry
+    pl.DataFrame(
+        {"sym": ["C"], "time": [datetime(2024, 12, 16, 9, 30)], "price": [1.0]}
+    ).write_parquet(day_files / "20241216.parquet")
+    assert syms("20241211-20241216").len() == 4
+    assert len(calls) == 2
+
+    # so does an empty day being filled
+    pl.DataFrame(
+        {"sym": ["D"], "time": [datetime(2024, 12, 13, 9, 30)], "price": [1.0]}
+    ).write_parquet(day_files / "20241213.parquet")
+    assert syms("20241211-20241216").len() == 5
+    assert len(calls) == 3
+
+
+def test_memoize_keys_arguments_by_content(day_files):
+    @memoize()
+    def total(values, scale: float = 1.0) -> pl.Series:
+        return pl.Series("total", [float(np.sum(values)) * scale])
+
+    a = np.arange(10000.0)
+    b = a.copy()
+    b[5000] = -1e9  # differs only where numpy's repr elides
+    assert total(a)[0] == 49995000.0
+    assert total(b)[0] == -950010000.0
+    assert total(a, scale=2.0)[0] == 99990000.0
+
+    with pytest.raises(TypeError):
+        total(pl.LazyFrame({"a": [1.0]}))
+
+
+def test_memoize_evicts_to_max_bytes(day_files, tmp_path):
+    @memoize(max_bytes=1)
+    def frame(n: int) -> pl.DataFrame:
+        return pl.DataFrame({"a": range(n)})
+
+    frame(10)
+    frame(20)
+    memo = tmp_path / "cache" / "memo"
+    assert len(list(memo.glob("*.json"))) <= 1
+
+    clear()
+    assert not list(memo.glob("*"))
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+import cyc.catalog
+from cyc.catalog import plan_reads, scan_catalog, schema_drift
+from cyc.data_loaders import load_data
+
+
+def test_scan_catalog(day_files):
+    catalog = scan_catalog("drift_test")
+
+    assert catalog["n_rows"].to_list() == [2, 1, 0]
+    assert catalog["syms"].to_list() == [None, None, None]
+    cache_path = day_files.parents[1] / "cache" / "catalog" / "drift_test.parquet"
+    assert cache_path.exists()
+
+    catalog = scan_catalog("drift_test", syms=True)
+    assert catalog["syms"].to_list() == [["A", "B"], ["A"], []]
+    assert catalog["n_syms"].to_list() == [2, 1, 0]
+
+
+@pytest.mark.skipif(cyc.catalog.pq is None, reason="pyarrow not installed")
+def test_scan_catalog_time_range_from_footer(day_files, monkeypatch):
+    def no_data_reads(*args, **kwargs):
+        raise AssertionError("data pages read")
+
+    monkeypatch.setattr(pl, "read_parquet", no_data_reads)
+    catalog = scan_catalog("drift_test")
+
+    assert catalog["time_min"][0] == datetime(2024, 12, 11, 9, 30)
+    assert catalog["time_max"][0] == datetime(2024, 12, 11, 9, 31)
+    assert catalog["time_max"][2] is None
+
+
+def test_scan_catalog_rescans_changed_files(day_files):
+    scan_catalog("drift_test", syms=True)
+    pl.DataFrame(
+        {"sym": ["C"], "time": [datetime(2024, 12, 13, 9, 30)], "price": [1.0]}
+    ).write_parquet(day_files / "20241213.parquet")
+
+    catalog = scan_catalog("drift_test", ["20241213"], syms=True)
+
+    assert catalog["syms"].to_list() == [["C"]]
+
+
+def test_schema_drift(day_files):
+    drift = schema_drift(scan_catalog("drift_test"))
+
+    assert set(drift["column"]) == {"price", "size"}
+    assert drift.filter(pl.col("column") == "price")["n_days"].sum() == 3
+
+
+def test_plan_reads_and_load_data(day_files):
+    dates = ["20241211", "20241212", "20241213", "20241216"]
+    files, missing, schema = plan_reads(dates, "drift_test")
+
+    assert [date for date, _ in files] == ["20241211", "20241212"]
+    assert missing == ["20241216"]
+    assert schema["price"] == pl.Float64
+    assert "size" in schema
+
+    assert not (day_files.parents[1] / "cache").exists()
+
+    df = load_data("20241211-20241213", "drift_test")
+    assert df.shape == (3, 5)
+    assert df["size"].to_list() == [None, None, 10]
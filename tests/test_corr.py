@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from cyc.corr import CorrAccumulator, corr_matrix, returns_matrix, rolling_corr
+from cyc.df import Df
+
+
+def _bars(n_days: int = 3, n_bars: int = 50, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for d in range(n_days):
+        start = datetime(2024, 12, 2 + d, 9, 30)
+        times = [start + timedelta(minutes=i) for i in range(n_bars)]
+        lead = rng.normal(size=n_bars)
+        for sym, noise in (("A", 0.0), ("B", 1.0), ("C", 5.0)):
+            ret = np.roll(lead, sym == "B") + noise * rng.normal(size=n_bars)
+            frames.append(
+                pl.DataFrame(
+                    {
+                        "sym": sym,
+                        "time": pl.Series(times, dtype=pl.Datetime("ns")),
+                        "price": 100 * np.cumprod(1 + 0.001 * ret),
+                    }
+                )
+            )
+    return pl.concat(frames)
+
+
+def test_corr_matrix_matches_numpy():
+    bars = _bars()
+    acc = corr_matrix(bars.lazy(), lags=[0, 1], block_size=2)
+
+    days = bars.with_columns(pl.col("time").dt.date().alias("date"))
+    x = np.vstack(
+        [returns_matrix(day, acc.syms) for day in days.partition_by("date")]
+    )
+    x = x[~np.isnan(x).any(axis=1)]
+    assert acc.syms == ["A", "B", "C"]
+    assert acc.corr(0) == pytest.approx(np.corrcoef(x.T))
+    assert acc.cov(0) == pytest.approx(np.cov(x.T))
+    # B follows A by one bar
+    assert acc.corr(1)[0, 1] > 0.5
+    assert acc.to_frame(1).columns == ["sym", "A", "B", "C"]
+
+    # a loaded Df is one frame, not an iterable of rows
+    loaded = corr_matrix(Df(bars, "polygon_test"), lags=[0, 1], block_size=2)
+    assert loaded.corr(0) == pytest.approx(acc.corr(0))
+
+
+def test_corr_pairwise_complete():
+    x = np.array([[1.0, 2.0], [2.0, np.nan], [3.0, 7.0], [5.0, 1.0]])
+    acc = CorrAccumulator(["A", "B"]).update(x)
+
+    complete = x[[0, 2, 3]]
+    assert acc.corr()[0, 1] == pytest.approx(np.corrcoef(complete.T)[0, 1])
+    assert acc.stats[0]["n"][0, 0] == 4
+
+
+def test_rolling_corr_matches_window():
+    bars = _bars(n_days=4)
+    rolled = [(day, acc.corr().copy()) for day, acc in rolling_corr(bars, window=2)]
+    last_two = bars.filter(pl.col("time").dt.day() >= 4)
+
+    assert len(rolled) == 4
+    assert rolled[-1][1] == pytest.approx(corr_matrix(last_two).corr())
+
+
+def test_corr_matrix_streams_chunks_and_adds_new_syms():
+    bars = _bars(n_days=3)
+    # C only appears from the second day on
+    bars = bars.filter((pl.col("sym") != "C") | (pl.col("time").dt.day() > 2))
+    days = bars.with_columns(pl.col("time").dt.date().alias("d")).sort("d")
+    chunks = [
+        Df(part.drop("d"), "polygon_test")
+        for part in days.partition_by("d", maintain_order=True)
+    ]
+
+    streamed = corr_matrix(iter(chunks), lags=[0, 1])
+    fixed = corr_matrix(bars, lags=[0, 1], syms=["A", "B", "C"])
+
+    assert streamed.syms == ["A", "B", "C"]
+    for lag in (0, 1):
+        for name, value in fixed.stats[lag].items():
+            assert streamed.stats[lag][name] == pytest.approx(value)
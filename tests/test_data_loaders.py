@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import threading
+import time
+
+import pytest
+
+import cyc.data_loaders
+from cyc.data_loaders import aiter_data, iter_data
+
+
+def test_iter_data_prefetch_and_chunks(day_files):
+    chunks = list(iter_data("20241211-20241213", "drift_test", columns=["price"]))
+
+    assert [c.shape for c in chunks] == [(2, 4), (1, 4)]
+    assert chunks[1].columns == ["sym", "time", "price", "date"]
+
+    chunks = list(
+        iter_data("20241211-20241213", "drift_test", prefetch=0, chunk_days=2)
+    )
+    assert [c.height for c in chunks] == [3]
+
+
+def test_aiter_data(day_files):
+    async def collect():
+        return [df.height async for df in aiter_data("20241211-20241213", "drift_test")]
+
+    assert asyncio.run(collect()) == [2, 1]
+
+
+def test_aiter_data_cancel_while_reading(day_files, monkeypatch):
+    read_day = cyc.data_loaders._read_day
+
+    def slow_read_day(*args):
+        time.sleep(0.2)
+        return read_day(*args)
+
+    monkeypatch.setattr(cyc.data_loaders, "_read_day", slow_read_day)
+
+    async def consume():
+        async for _ in aiter_data("20241211-20241213", "drift_test"):
+            pass
+
+    async def cancel_mid_read():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_mid_read())
+    pools = [t for t in threading.enumerate() if t.name.startswith("ThreadPool")]
+    assert not pools
+
+
+def test_aiter_data_close_does_not_block_loop(day_files, monkeypatch):
+    read_day = cyc.data_loaders._read_day
+
+    def slow_read_day(*args):
+        time.sleep(0.3)
+        return read_day(*args)
+
+    monkeypatch.setattr(cyc.data_loaders, "_read_day", slow_read_day)
+
+    async def first_then_break():
+        chunks = aiter_data("20241211-20241213", "drift_test", prefetch=1)
+        async with contextlib.aclosing(chunks):
+            async for _ in chunks:
+                break
+
+    async def max_tick_gap():
+        consumer = asyncio.create_task(first_then_break())
+        gap, last = 0.0, time.perf_counter()
+        while not consumer.done():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gap, last = max(gap, now - last), now
+        await consumer
+        return gap
+
+    # the second read is still in flight when the consumer breaks
+    assert asyncio.run(max_tick_gap()) < 0.15
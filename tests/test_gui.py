@@ -0,0 +1,70 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from cyc.gui import gs_row, screen, screen_buckets
+
+
+def _features() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 1000
+    x1 = rng.normal(size=n)
+    x2 = rng.normal(size=n)
+    return pl.DataFrame(
+        {
+            "date": np.repeat(["20241211", "20241212"], n // 2),
+            "x1": x1,
+            "x2": x2,
+            "y": 2 * x1 + 1 + 0.1 * rng.normal(size=n),
+        }
+    ).with_columns(
+        pl.when(pl.int_range(pl.len()) % 10 == 0).then(None).otherwise("x2").alias("x2")
+    )
+
+
+def test_screen_matches_polyfit():
+    df = _features()
+    result = screen(df, ["x1", "x2"], "y")
+
+    assert result.columns == [
+        "feature", "target", "n", "slope", "intercept", "r2", "t_stat", "corr"
+    ]
+    x1 = result.row(0, named=True)
+    slope, intercept = np.polyfit(df["x1"].to_numpy(), df["y"].to_numpy(), 1)
+    assert x1["slope"] == pytest.approx(slope)
+    assert x1["intercept"] == pytest.approx(intercept)
+    assert x1["r2"] > 0.99
+    assert result["n"].to_list() == [1000, 900]
+    assert abs(result["t_stat"][1]) < 4
+
+
+def test_screen_by_date_and_buckets():
+    df = _features()
+    result = screen(df.lazy(), ["x1", "x2"], ["y", "x1"], by="date")
+
+    assert result.height == 8
+    assert result["date"].unique().sort().to_list() == ["20241211", "20241212"]
+
+    buckets = screen_buckets(df, ["x1", "x2"], "y", k=5)
+    x1 = buckets.filter(pl.col("feature") == "x1")
+    assert x1["bucket"].to_list() == [0, 1, 2, 3, 4]
+    assert x1["n"].sum() == 1000
+    assert x1["y"].is_sorted()
+    assert buckets.filter(pl.col("feature") == "x2")["n"].sum() == 900
+    assert buckets.columns == ["feature", "target", "bucket", "n", "x", "y"]
+
+    chart = gs_row(df, result.row(0, named=True))
+    assert chart is not None
+
+
+def test_screen_buckets_drops_null_targets_like_gs():
+    df = _features().with_columns(
+        pl.when(pl.int_range(pl.len()) % 4 == 0).then(None).otherwise("y").alias("y")
+    )
+    buckets = screen_buckets(df, ["x1", "x2", "y"], ["y", "x1"], k=5, by="date")
+
+    n = buckets.group_by("feature", "target").agg(pl.col("n").sum())
+    stats = screen(df, ["x1", "x2", "y"], ["y", "x1"]).select("feature", "target", "n")
+    assert n.sort("feature", "target").equals(stats.cast({"n": n["n"].dtype}))
+    x1 = buckets.filter((pl.col("feature") == "x1") & (pl.col("target") == "y"))
+    assert x1["n"].sum() == 750
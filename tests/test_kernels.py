@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+import cyc.kernels
+from cyc.kernels import KERNELS, register_kernel, run_kernel
+
+
+def _bars() -> pl.DataFrame:
+    t = [datetime(2024, 12, 11, 9, 30) + timedelta(minutes=i) for i in range(4)]
+    return pl.DataFrame(
+        {
+            # interleaved and unsorted on purpose
+            "sym": ["B", "A", "A", "B", "A", "B", "A", "B"],
+            "time": [t[0], t[1], t[0], t[1], t[2], t[3], t[3], t[2]],
+            "price": [10.0, 12.0, 10.0, 8.0, 9.0, 12.0, 11.0, 6.0],
+        }
+    )
+
+
+@pytest.fixture(params=["compiled", "fallback", "python"])
+def mode(request, monkeypatch):
+    for kernel in KERNELS.values():
+        if request.param != "compiled":
+            monkeypatch.setattr(kernel, "driver", None)
+        if request.param == "python":
+            monkeypatch.setattr(kernel, "fallback", None)
+    if request.param == "compiled" and cyc.kernels.numba is None:
+        pytest.skip("numba not installed")
+    return request.param
+
+
+def test_drawdown(mode):
+    df = _bars().run_kernel("drawdown", "price")
+    result = df.sort("sym", "time")["drawdown"].to_list()
+
+    expected = [0.0, 0.0, -0.25, 11 / 12 - 1, 0.0, -0.2, -0.4, 0.0]
+    assert result == pytest.approx(expected)
+    assert df["sym"].to_list() == _bars()["sym"].to_list()
+
+
+def test_inputs_may_be_by_or_order(mode):
+    df = _bars().with_columns(pl.col("time").dt.minute().cast(pl.Float64).alias("t"))
+
+    # the order column as input: an increasing series never draws down
+    result = df.run_kernel("drawdown", "t", order="t")
+    assert result["drawdown"].to_list() == [0.0] * 8
+
+    # the by column as input: each minute holds two bars, a run of 1 then 2
+    result = df.run_kernel("sign_run", ["t", "t"], by="t", order="t")
+    assert sorted(result["sign_run"]) == [1.0] * 4 + [2.0] * 4
+
+
+def test_reset_cumsum_and_sign_run(mode):
+    df = pl.DataFrame(
+        {
+            "sym": ["A"] * 6,
+            "time": list(range(6)),
+            "x": [1.0, 2.0, -1.0, 0.5, np.nan, -3.0],
+        }
+    )
+
+    reset = run_kernel(df, "reset_cumsum", "x", params=[3.0])["reset_cumsum"]
+    assert reset.to_list() == [1.0, 3.0, -1.0, -0.5, -0.5, -3.5]
+
+    run = run_kernel(df, "sign_run", ["x"], alias="run")["run"]
+    assert run.to_list() == [1.0, 2.0, -1.0, 1.0, 0.0, -1.0]
+
+
+def test_register_kernel(mode):
+    @register_kernel("_test_diff")
+    def diff(start, end, cols, params, out):
+        for i in range(start, end):
+            out[i] = cols[1][i] - cols[0][i] * params[0]
+
+    df = _bars().with_columns(pl.col("price").alias("p2"))
+    result = df.run_kernel("_test_diff", ["price", "p2"], params=[2])
+    assert (result["_test_diff"] == -result["price"]).all()
+    KERNELS.pop("_test_diff")
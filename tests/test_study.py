@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+import cyc.study  # noqa: F401  registers DataFrame methods
+from cyc.df import Df
+from cyc.study import event_paths, event_summary
+
+
+def _minute_bars() -> pl.DataFrame:
+    # 20241129 closes early at 13:00; 20241202 is a full session
+    times = [
+        datetime(2024, 11, 29, 12, 58),
+        datetime(2024, 11, 29, 12, 59),
+        datetime(2024, 11, 29, 13, 0),
+        datetime(2024, 11, 29, 13, 5),
+        datetime(2024, 12, 2, 9, 30),
+        datetime(2024, 12, 2, 9, 33),
+        datetime(2024, 12, 2, 9, 35),
+    ]
+    return pl.DataFrame(
+        {
+            "sym": ["A"] * len(times),
+            "time": pl.Series(times, dtype=pl.Datetime("ns")),
+            "price": [100.0, 101.0, 102.0, 103.0, 200.0, 202.0, 210.0],
+        }
+    )
+
+
+def test_get_fwd_returns_respects_early_close_and_gaps():
+    df = _minute_bars().get_fwd_returns(["1m", "5m", "close"])
+
+    assert df["ret_1m"][:2].to_list() == pytest.approx([0.01, 102 / 101 - 1])
+    assert df["ret_1m"][2] is None
+    # 12:58 + 5m is past the 13:00 early close
+    assert df["ret_5m"][0] is None
+    assert df["ret_close"][0] == pytest.approx(0.02)
+    # rows after the close get no labels
+    assert df.row(3, named=True)["ret_1m"] is None
+    # 9:30 + 1m falls in a gap and uses 9:30 itself; no leakage from the prior day
+    assert df["ret_1m"][4] == pytest.approx(0.0)
+    assert df["ret_5m"][4] == pytest.approx(0.05)
+    assert df["ret_close"][4] == pytest.approx(0.05)
+
+
+def test_get_fwd_returns_after_close_only_day():
+    df = pl.DataFrame(
+        {
+            "sym": ["A", "A"],
+            "time": pl.Series(
+                [datetime(2024, 12, 2, 17), datetime(2024, 12, 2, 18)],
+                dtype=pl.Datetime("ns"),
+            ),
+            "price": [1.0, 2.0],
+        }
+    ).get_fwd_returns(["1h", "close"])
+
+    assert df["ret_1h"].to_list() == [None, None]
+    assert df["ret_close"].to_list() == [None, None]
+
+
+def test_get_fwd_returns_lazy_and_df():
+    bars = _minute_bars().sample(fraction=1.0, shuffle=True, seed=0)
+    eager = bars.get_fwd_returns(["5m"])
+    lazy = bars.lazy().get_fwd_returns(["5m"])
+
+    assert isinstance(lazy, pl.LazyFrame)
+    assert lazy.collect().equals(eager)
+    assert eager["time"].equals(bars["time"])
+    assert Df(bars).get_fwd_returns(["5m"]).columns[-1] == "ret_5m"
+
+
+def test_event_paths_daily():
+    days = [datetime(2024, 12, d) for d in (2, 3, 4, 5, 6)]
+    data = pl.DataFrame(
+        {
+            "sym": ["A"] * 5 + ["B"] * 5,
+            "time": pl.Series(days * 2, dtype=pl.Datetime("ns")),
+            "close": [10.0, 11.0, 12.0, 13.0, 14.0, 20.0, 22.0, 24.0, 26.0, 28.0],
+        }
+    )
+    events = pl.DataFrame(
+        {
+            "sym": ["A", "B"],
+            "date": [datetime(2024, 12, 3).date(), datetime(2024, 12, 1).date()],
+            "kind": ["earnings", "split"],
+        }
+    )
+
+    paths = event_paths(data, events, (-1, 2), field="close")
+
+    assert paths.columns == ["event_id", "sym", "date", "kind", "rel", "close", "ret"]
+    a = paths.filter(pl.col("event_id") == 0)
+    assert a["close"].to_list() == [10.0, 11.0, 12.0, 13.0]
+    assert a["ret"][0] == pytest.approx(10 / 11 - 1)
+    # a weekend event anchors on the next trading day in data
+    b = paths.filter(pl.col("event_id") == 1)
+    assert b["close"].to_list() == [None, 20.0, 22.0, 24.0]
+
+    summary = event_summary(paths)
+    assert summary["rel"].to_list() == [-1, 0, 1, 2]
+    assert summary["n"].to_list() == [1, 2, 2, 2]
+    assert summary["mean"][2] == pytest.approx((12 / 11 + 22 / 20) / 2 - 1)
+
+
+def test_event_paths_daily_on_intraday_bars():
+    times = [datetime(2024, 12, d, h) for d in (2, 3, 4) for h in (10, 11, 12)]
+    data = pl.DataFrame(
+        {
+            "sym": ["A"] * len(times),
+            "time": pl.Series(times, dtype=pl.Datetime("ns")),
+            "price": [float(i) for i in range(1, len(times) + 1)],
+        }
+    )
+    events = pl.DataFrame({"sym": ["A"], "date": [datetime(2024, 12, 3).date()]})
+
+    paths = event_paths(data, events, (-1, 1))
+
+    # each offset is a day, valued at that day's last bar
+    assert paths["rel"].to_list() == [-1, 0, 1]
+    assert paths["price"].to_list() == [3.0, 6.0, 9.0]
+
+
+def test_event_paths_minutes_lazy():
+    data = _minute_bars()
+    events = pl.DataFrame(
+        {
+            "sym": ["A"],
+            "time": pl.Series([datetime(2024, 12, 2, 9, 31)], dtype=pl.Datetime("ns")),
+        }
+    )
+
+    paths = event_paths(data.lazy(), events, (-2, 5), unit="m")
+
+    assert isinstance(paths, pl.LazyFrame)
+    prices = paths.collect()["price"].to_list()
+    # 9:29 has no bar that day; after 9:35 the day ends
+    assert prices == [None, 200.0, 200.0, 200.0, 202.0, 202.0, 210.0, None]